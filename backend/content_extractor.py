@@ -1,14 +1,132 @@
 import aiohttp
 import asyncio
+import time
+from collections import defaultdict, OrderedDict
 from typing import List, Dict, Optional, Any
 from urllib.parse import urljoin, urlparse
 import re
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 import logging
-from bs4 import BeautifulSoup, Comment
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import ahocorasick
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from cssselect import HTMLTranslator
+from search_handler import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
+# Patterns used by ContentExtractor._clean_text, compiled once at import
+_WS_RE = re.compile(r'\s+')
+_URL_RE = re.compile(r'https?://\S+')
+_EMAIL_RE = re.compile(r'\S+@\S+\.\S+')
+# Footnote markers such as [3] or [4, 7]; the brackets are gone after _PUNCT_TABLE.
+# Up to three digits, so bracketed years like [2019] are kept.
+_CITATION_RE = re.compile(r'\s*\[\d{1,3}(?:\s*[,\u2013-]\s*\d{1,3})*\]')
+
+class _PunctuationTable(dict):
+    """
+    str.translate table mapping every character that is not a word character,
+    whitespace or one of .,;:!?()- to a space. Entries are filled in on first
+    lookup, so any code point is handled while repeat lookups stay in C.
+    """
+    _allowed = frozenset('.,;:!?()-_')
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        keep = char.isalnum() or char.isspace() or char in self._allowed
+        value = codepoint if keep else ' '
+        self[codepoint] = value
+        return value
+
+_PUNCT_TABLE = _PunctuationTable()
+
+# Common navigation/footer text patterns, merged into one alternation so the
+# text is scanned once rather than once per pattern
+_BOILERPLATE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'Skip to main content',
+    r'Skip to content',
+    r'Subscribe to newsletter',
+    r'Follow us on \w+',
+    r'Copyright \d{4}.*?(?:\.|$)',
+    r'All rights reserved.*?(?:\.|$)',
+    r'Privacy Policy',
+    r'Terms of Service',
+    r'Cookie Policy',
+    r'Sign up for.*?newsletter',
+    r'Share this.*?(?:\.|$)',
+    r'Print this page',
+    r'Email this page',
+    r'Last updated:.*?(?:\.|$)',
+    r'Date modified:.*?(?:\.|$)'
+]), re.IGNORECASE)
+
+# Government/policy keywords used by ContentExtractor._is_quality_content
+_RELEVANT_KEYWORDS = (
+    'policy', 'government', 'minister', 'department', 'regulation',
+    'legislation', 'parliament', 'federal', 'provincial', 'municipal',
+    'public', 'service', 'report', 'budget', 'strategy', 'framework',
+    'initiative', 'program', 'act', 'bill', 'committee', 'council',
+    'administration', 'agency', 'authority', 'commission'
+)
+
+# Comments are dropped by the parser itself rather than walked afterwards
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+_UNWANTED_TAGS = ('script', 'style', 'nav', 'header', 'footer',
+                  'aside', 'advertisement', 'ads', 'form', 'iframe',
+                  'noscript', 'svg', 'canvas')
+
+# Main content selectors in order of preference
+_CONTENT_SELECTORS = [
+    'main',
+    'article',
+    '[role="main"]',
+    '.content',
+    '#content',
+    '.main-content',
+    '.article-content',
+    '.post-content',
+    '.entry-content',
+    '.page-content'
+]
+
+# All candidates are collected with one XPath union over the tree; each
+# candidate is then ranked by the first selector it matches on its own
+_CONTENT_CANDIDATES = CSSSelector(', '.join(_CONTENT_SELECTORS), translator='html')
+_CONTENT_RANKERS = tuple(
+    etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix='self::'))
+    for selector in _CONTENT_SELECTORS
+)
+
+_BODY_NOISE_SELECTOR = CSSSelector(
+    'nav, .nav, .sidebar, .menu, .navigation, .breadcrumbs, .footer, .header',
+    translator='html'
+)
+
+def _element_text(element) -> str:
+    """
+    Join the stripped, non-empty text nodes under an element with spaces
+    """
+    return ' '.join(text for text in (s.strip() for s in element.itertext()) if text)
+
+@lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> CSSSelector:
+    """
+    Compile a CSS selector to XPath once per worker process
+    """
+    return CSSSelector(selector, translator='html')
+
+def _content_rank(element) -> int:
+    """
+    Index of the most preferred content selector matching the element
+    """
+    return next(rank for rank, matches in enumerate(_CONTENT_RANKERS) if matches(element))
+
 class ExtractedContent:
     def __init__(self, title: str, url: str, content: str, domain: str, word_count: int):
         self.title = title
@@ -16,17 +134,57 @@ class ExtractedContent:
         self.content = content
         self.domain = domain
         self.word_count = word_count
-        self.extraction_date = datetime.utcnow().isoformat()
+        self._extracted_at = time.time()
+    
+    @property
+    def extraction_date(self) -> str:
+        # Formatted on demand; nothing on the request path reads it
+        return datetime.fromtimestamp(self._extracted_at, timezone.utc).isoformat()
+
+class _CachedPage:
+    def __init__(self, content: ExtractedContent, etag: Optional[str], last_modified: Optional[str]):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
 
 class ContentExtractor:
     def __init__(self):
-        self.timeout = aiohttp.ClientTimeout(total=30)
+        self.timeout = aiohttp.ClientTimeout(total=30, sock_connect=5, sock_read=10)
         self.max_content_length = 50000  # Characters
         self.min_content_length = 200    # Characters
+        self.max_response_bytes = 2_000_000  # Stop reading pages past this size
+        
+        # Bound concurrent fetches overall and per host
+        self._semaphore = asyncio.Semaphore(8)
+        self._host_semaphores = defaultdict(lambda: asyncio.Semaphore(2))
         
-    async def extract_multiple(self, search_results: List[Any]) -> List['ExtractedContent']:
+        # Extracted pages keyed by canonical URL; government pages change slowly
+        self.cache_ttl = 24 * 3600  # Seconds before a cached page is revalidated
+        self.cache_size = 2048
+        self._cache: 'OrderedDict[str, _CachedPage]' = OrderedDict()
+        
+        # Content selector that last matched per domain, tried before the full
+        # selector list; '*.' entries match any subdomain
+        self._domain_hints: Dict[str, str] = {
+            'canada.ca': 'main',
+            '*.gc.ca': 'main',
+            'ontario.ca': '#main-content',
+        }
+        
+        # Worker processes for HTML parsing and text cleanup
+        self.parse_timeout = 20  # Seconds before a stuck parse is abandoned
+        self._pool = self._new_pool()
+        
+        # Finds every relevant keyword in a single pass over the content
+        self._keyword_automaton = ahocorasick.Automaton()
+        for keyword in _RELEVANT_KEYWORDS:
+            self._keyword_automaton.add_word(keyword, keyword)
+        self._keyword_automaton.make_automaton()
+        
+    async def extract_multiple(self, search_results: List[Any], session: aiohttp.ClientSession) -> List['ExtractedContent']:
         """
-        Extract content from multiple URLs concurrently
+        Extract content from multiple URLs concurrently using the shared session
         """
         # ADD: Input logging
         logger.info(f"CONTENT_EXTRACTOR INPUT - {len(search_results)} URLs:")
@@ -37,16 +195,15 @@ class ContentExtractor:
         
         extracted_content = []
         
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            # Process URLs concurrently
-            tasks = [self._extract_single_url(session, result) for result in search_results]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, ExtractedContent):
-                    extracted_content.append(result)
-                elif isinstance(result, Exception):
-                    logger.error(f"Content extraction failed: {result}")
+        # Process URLs concurrently
+        tasks = [self._extract_single_url(session, result) for result in search_results]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, ExtractedContent):
+                extracted_content.append(result)
+            elif isinstance(result, Exception):
+                logger.error(f"Content extraction failed: {result}")
         
         # Filter by content quality
         quality_content = [content for content in extracted_content 
@@ -54,53 +211,109 @@ class ContentExtractor:
         
         return quality_content
     
+    def close(self):
+        """
+        Shut down the worker process pool
+        """
+        self._pool.shutdown()
+    
     async def _extract_single_url(self, session: aiohttp.ClientSession, search_result: Any) -> Optional[ExtractedContent]:
         """
         Extract content from a single URL
         """
         url = search_result.url
+        try:
+            cache_key = canonicalize_url(url)
+        except ValueError:
+            logger.warning(f"Malformed URL skipped: {url}")
+            return None
+        cached = self._cache.get(cache_key)
+        
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            if time.monotonic() - cached.stored_at < self.cache_ttl:
+                logger.debug(f"CACHE HIT: {url}")
+                return cached.content
         
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (compatible; GovernmentDocBot/1.0; +https://example.com/bot)",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
+                "Accept-Encoding": "gzip, deflate, br",
                 "Connection": "keep-alive",
             }
             
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    logger.warning(f"HTTP {response.status} for {url}")
-                    return None
-                
-                # Check content type
-                content_type = response.headers.get('content-type', '').lower()
-                if 'text/html' not in content_type:
-                    logger.warning(f"Non-HTML content for {url}")
-                    return None
-                
-                html_content = await response.text()
-                
-                # Extract clean content
-                extracted = self._extract_clean_content(html_content, url)
-                
-                if extracted:
-                    word_count = len(extracted['content'].split())
+            # Revalidate a stale cache entry instead of refetching it outright
+            if cached is not None:
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+            
+            # Hold a slot only while fetching; one slow host cannot take every slot
+            async with self._host_semaphores[search_result.domain], self._semaphore:
+                async with session.get(url, headers=headers, timeout=self.timeout) as response:
+                    if response.status == 304 and cached is not None:
+                        logger.debug(f"CACHE REVALIDATED: {url}")
+                        cached.stored_at = time.monotonic()
+                        return cached.content
+                    
+                    if response.status != 200:
+                        logger.warning(f"HTTP {response.status} for {url}")
+                        return None
                     
-                    # ADD: Success logging with content preview
-                    logger.info(f"EXTRACTED SUCCESS: {url} - {word_count} words - {html_content}")
-                    logger.debug(f"CONTENT_PREVIEW: {extracted['content'][:200]}...")
+                    # Check content type
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'text/html' not in content_type:
+                        logger.warning(f"Non-HTML content for {url}")
+                        return None
                     
-                    return ExtractedContent(
-                        title=extracted['title'],
-                        url=url,
-                        content=extracted['content'],
-                        domain=search_result.domain,
-                        word_count=word_count
-                    )
+                    # Read in chunks and stop at the size cap rather than buffering the whole body
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(16384):
+                        body.extend(chunk)
+                        if len(body) > self.max_response_bytes:
+                            logger.debug(f"Truncated response at {len(body)} bytes for {url}")
+                            break
+                    
+                    try:
+                        html_content = body.decode(response.charset or 'utf-8', errors='replace')
+                    except LookupError:
+                        # Unknown charset in the Content-Type header
+                        html_content = body.decode('utf-8', errors='replace')
+                    
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+            
+            # Extract clean content; parsing and cleaning are CPU-bound, so run
+            # them in the process pool while the event loop keeps fetching
+            extracted = await self._parse_in_pool(html_content, url, self._selector_hint(search_result.domain))
+            
+            if extracted:
+                # Learn the selector that won; forget a learned hint that didn't
+                if extracted['selector']:
+                    self._domain_hints[search_result.domain] = extracted['selector']
                 else:
-                    logger.warning(f"EXTRACTION FAILED: Could not extract content from {url}")
+                    self._domain_hints.pop(search_result.domain, None)
+                
+                word_count = len(extracted['content'].split())
+                
+                # ADD: Success logging with content preview
+                logger.info(f"EXTRACTED SUCCESS: {url} - {word_count} words - {html_content}")
+                logger.debug(f"CONTENT_PREVIEW: {extracted['content'][:200]}...")
+                
+                content = ExtractedContent(
+                    title=extracted['title'],
+                    url=url,
+                    content=extracted['content'],
+                    domain=search_result.domain,
+                    word_count=word_count
+                )
+                self._cache_put(cache_key, _CachedPage(content, etag, last_modified))
+                return content
+            else:
+                logger.warning(f"EXTRACTION FAILED: Could not extract content from {url}")
         
         except asyncio.TimeoutError:
             logger.warning(f"Timeout extracting content from {url}")
@@ -109,69 +322,121 @@ class ContentExtractor:
         
         return None
     
-    def _extract_clean_content(self, html_content: str, url: str) -> Optional[Dict[str, str]]:
+    @staticmethod
+    def _new_pool() -> ProcessPoolExecutor:
+        """
+        Worker pool for parsing. Workers come from a forkserver rather than a
+        fork of this process, which by then is running threads.
+        """
+        return ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+    
+    def _replace_pool(self, pool: ProcessPoolExecutor, terminate: bool = False):
+        """
+        Swap in a fresh worker pool unless another task already replaced this
+        one; with terminate, the old workers are killed so a stuck one exits
+        """
+        if self._pool is not pool:
+            return
+        logger.warning("Content worker pool %s; restarting it", "stuck" if terminate else "broke")
+        self._pool = self._new_pool()
+        if terminate:
+            # There is no public way to stop a running task; the other pages
+            # parsing on this pool see BrokenProcessPool and are retried
+            for process in list((pool._processes or {}).values()):
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    async def _parse_in_pool(self, html_content: str, url: str, selector_hint: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        Run _extract_clean_content in the worker pool within parse_timeout. If a
+        worker has died the pool is broken for good, so it is replaced and the
+        page tried once more; a parse that times out restarts the pool too.
+        """
+        loop = asyncio.get_running_loop()
+        args = (html_content, url, self.min_content_length, self.max_content_length, selector_hint)
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(pool, ContentExtractor._extract_clean_content, *args),
+                    self.parse_timeout
+                )
+            except asyncio.TimeoutError:
+                self._replace_pool(pool, terminate=True)
+                raise
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+                if attempt:
+                    raise
+    
+    @staticmethod
+    def _extract_clean_content(html_content: str, url: str, min_content_length: int,
+                               max_content_length: int, selector_hint: Optional[str] = None) -> Optional[Dict[str, str]]:
         """
-        Extract clean text content from HTML using BeautifulSoup only
+        Extract clean text content from HTML using lxml. Static so it can be
+        pickled into the process pool. The returned 'selector' names the content
+        selector that matched, or is None when the body fallback was used.
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            root = lxml_html.document_fromstring(html_content.encode('utf-8'), parser=_HTML_PARSER)
             
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 
-                               'aside', 'advertisement', 'ads', 'form', 'iframe',
-                               'noscript', 'svg', 'canvas']):
-                element.decompose()
-            
-            # Remove comments
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                comment.extract()
+            # Remove unwanted elements, keeping a word break before the text that follows them
+            for element in root.iter(*_UNWANTED_TAGS):
+                if element.tail:
+                    element.tail = ' ' + element.tail
+            etree.strip_elements(root, *_UNWANTED_TAGS, with_tail=False)
             
             # Extract title
-            title_elem = soup.find('title')
-            title = title_elem.get_text().strip() if title_elem else "Untitled"
+            title_elem = root.find('.//title')
+            title = title_elem.text_content().strip() if title_elem is not None else "Untitled"
             
             # Clean up title
-            title = re.sub(r'\s+', ' ', title)
+            title = _WS_RE.sub(' ', title)
             if len(title) > 100:
                 title = title[:100] + "..."
             
-            # Extract main content (try multiple selectors in order of preference)
-            content_selectors = [
-                'main',
-                'article', 
-                '[role="main"]',
-                '.content',
-                '#content',
-                '.main-content',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                '.page-content'
-            ]
-            
+            # Extract main content: try the selector that worked before for this
+            # domain, else the first element, in document order, matching the
+            # most preferred selector. A hinted match too short to use counts
+            # as a miss.
             content_text = ""
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    content_text = elements[0].get_text(separator=' ', strip=True)
-                    break
+            selector = None
+            hinted = _compile_selector(selector_hint)(root) if selector_hint else None
+            if hinted:
+                content_text = _element_text(hinted[0])
+                selector = selector_hint
+            if len(content_text) < min_content_length:
+                content_text = ""
+                selector = None
+                candidates = _CONTENT_CANDIDATES(root)
+                if candidates:
+                    best = min(candidates, key=_content_rank)
+                    content_text = _element_text(best)
+                    selector = _CONTENT_SELECTORS[_content_rank(best)]
             
             # Fallback: extract from body, but remove common noise
-            if not content_text or len(content_text) < self.min_content_length:
-                body = soup.find('body')
-                if body:
+            if not content_text or len(content_text) < min_content_length:
+                selector = None
+                body = root.find('body')
+                if body is not None:
                     # Remove navigation, sidebars, etc.
-                    for noise in body.select('nav, .nav, .sidebar, .menu, .navigation, .breadcrumbs, .footer, .header'):
-                        noise.decompose()
-                    content_text = body.get_text(separator=' ', strip=True)
+                    for noise in _BODY_NOISE_SELECTOR(body):
+                        if noise.tail:
+                            noise.tail = ' ' + noise.tail
+                        noise.drop_tree()
+                    content_text = _element_text(body)
             
-            content_text = self._clean_text(content_text)
+            content_text = ContentExtractor._clean_text(content_text, max_content_length)
             
-            if len(content_text) >= self.min_content_length:
+            if len(content_text) >= min_content_length:
                 logger.debug(f"CONTENT_EXTRACTION SUCCESS: {len(content_text)} chars from {url}")
                 return {
                     'title': title,
-                    'content': content_text
+                    'content': content_text,
+                    'selector': selector
                 }
             else:
                 logger.debug(f"CONTENT_EXTRACTION FAILED: Only {len(content_text)} chars from {url}")
@@ -181,50 +446,64 @@ class ContentExtractor:
         
         return None
     
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _clean_text(text: str, max_content_length: int) -> str:
         """
-        Clean and normalize extracted text
+        Clean and normalize extracted text: collapse whitespace and strip
+        boilerplate, URLs, email addresses and footnote markers such as [3]
         """
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = ' '.join(text.split())
         
         # Remove common navigation/footer text patterns
-        patterns_to_remove = [
-            r'Skip to main content',
-            r'Skip to content',
-            r'Subscribe to newsletter',
-            r'Follow us on \w+',
-            r'Copyright \d{4}.*?(?:\.|$)',
-            r'All rights reserved.*?(?:\.|$)',
-            r'Privacy Policy',
-            r'Terms of Service',
-            r'Cookie Policy',
-            r'Sign up for.*?newsletter',
-            r'Share this.*?(?:\.|$)',
-            r'Print this page',
-            r'Email this page',
-            r'Last updated:.*?(?:\.|$)',
-            r'Date modified:.*?(?:\.|$)'
-        ]
-        
-        for pattern in patterns_to_remove:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        text = _BOILERPLATE_RE.sub('', text)
         
         # Remove URLs and email addresses
-        text = re.sub(r'https?://\S+', '', text)
-        text = re.sub(r'\S+@\S+\.\S+', '', text)
+        text = _URL_RE.sub('', text)
+        text = _EMAIL_RE.sub('', text)
+        
+        # Remove citation markers while their brackets still identify them
+        text = _CITATION_RE.sub('', text)
         
         # Remove excessive punctuation
-        text = re.sub(r'[^\w\s.,;:!?()-]', ' ', text)
+        text = text.translate(_PUNCT_TABLE)
         
         # Final whitespace cleanup
-        text = re.sub(r'\s+', ' ', text)
+        text = ' '.join(text.split())
         
         # Limit length
-        if len(text) > self.max_content_length:
-            text = text[:self.max_content_length] + "..."
+        if len(text) > max_content_length:
+            text = text[:max_content_length] + "..."
         
-        return text.strip()
+        return text
+    
+    def _selector_hint(self, domain: str) -> Optional[str]:
+        """
+        Look up the content selector hint for a domain, its bare host and its parent domains
+        """
+        if domain in self._domain_hints:
+            return self._domain_hints[domain]
+        
+        host = domain[4:] if domain.startswith('www.') else domain
+        if host in self._domain_hints:
+            return self._domain_hints[host]
+        
+        labels = host.split('.')
+        for i in range(1, len(labels) - 1):
+            hint = self._domain_hints.get('*.' + '.'.join(labels[i:]))
+            if hint:
+                return hint
+        
+        return None
+    
+    def _cache_put(self, key: str, page: _CachedPage):
+        """
+        Store an extracted page, evicting the least recently used entries
+        """
+        self._cache[key] = page
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
     
     def _is_quality_content(self, content: ExtractedContent) -> bool:
         """
@@ -235,8 +514,11 @@ class ContentExtractor:
             logger.debug(f"Content too short: {content.word_count} words from {content.url}")
             return False
         
+        # Lower-case once for both the repetition and keyword checks
+        content_lower = content.content.lower()
+        
         # Check for excessive repetition (sign of boilerplate)
-        words = content.content.lower().split()
+        words = content_lower.split()
         unique_words = set(words)
         uniqueness = len(unique_words) / len(words) if words else 0
         
@@ -245,16 +527,8 @@ class ContentExtractor:
             return False
         
         # Check for government/policy relevant keywords
-        relevant_keywords = [
-            'policy', 'government', 'minister', 'department', 'regulation',
-            'legislation', 'parliament', 'federal', 'provincial', 'municipal',
-            'public', 'service', 'report', 'budget', 'strategy', 'framework',
-            'initiative', 'program', 'act', 'bill', 'committee', 'council',
-            'administration', 'agency', 'authority', 'commission'
-        ]
-        
-        content_lower = content.content.lower()
-        keyword_count = sum(1 for keyword in relevant_keywords if keyword in content_lower)
+        found_keywords = {keyword for _, keyword in self._keyword_automaton.iter(content_lower)}
+        keyword_count = len(found_keywords)
         
         # Should have at least 2 relevant keywords
         if keyword_count < 2:
@@ -5,10 +5,12 @@ from typing import List, Optional, Dict, Any
 import asyncio
 import aiohttp
 import os
+import time
 from urllib.parse import urljoin, urlparse
 import re
 from datetime import datetime
 import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -25,7 +27,32 @@ from summarizer import SourceSummary
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Search and Summarize API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One HTTP session for page fetches for the life of the app so DNS lookups,
+    # TLS sessions and keep-alive connections are reused across requests.
+    # SearchHandler keeps its own pool sized for SerpAPI.
+    app.state.http = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            resolver=aiohttp.AsyncResolver()
+        )
+    )
+    # The tokenizer may need downloading; fetch it off the event loop before serving
+    await asyncio.to_thread(Summarizer.load_encoding)
+    yield
+    await app.state.http.close()
+    await search_handler.aclose()
+    content_extractor.close()
+    await query_gen.client.close()
+    await summarizer.client.close()
+    summarizer.cache.close()
+
+app = FastAPI(title="Search and Summarize API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -67,7 +94,7 @@ async def search_and_summarize(request: DocumentRequest):
     """
     Main endpoint that orchestrates the entire search and summarization pipeline
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     try:
         # Step 1: Generate search queries
@@ -84,7 +111,7 @@ async def search_and_summarize(request: DocumentRequest):
         
         # Step 3: Extract content from URLs
         logger.info(f"Extracting content from {len(search_results)} URLs")
-        extracted_content = await content_extractor.extract_multiple(search_results)
+        extracted_content = await content_extractor.extract_multiple(search_results, app.state.http)
         
         # Step 4: Summarize each source
         logger.info("Summarizing individual sources")
@@ -99,7 +126,7 @@ async def search_and_summarize(request: DocumentRequest):
         )
         
         # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         return SearchResponse(
             queries=queries,
@@ -2,7 +2,7 @@ import openai
 import os
 from typing import List, Optional
 from pydantic import BaseModel
-import json
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,10 @@ class SearchQuery(BaseModel):
 
 class QueryGenerator:
     def __init__(self):
-        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=openai.DefaultAioHttpClient()
+        )
         
     async def generate_queries(self, subject: str, purpose: str, jurisdiction: Optional[str] = None) -> List[SearchQuery]:
         """
@@ -77,7 +80,7 @@ Generate queries now:
             elif "```" in content:
                 content = content.split("```")[1].strip()
                 
-            queries_data = json.loads(content)
+            queries_data = orjson.loads(content)
             
             # Validate and convert to SearchQuery objects
             queries = []
@@ -99,7 +102,7 @@ Generate queries now:
             
             return queries
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {e}")
             return self._generate_fallback_queries(subject, purpose, jurisdiction)
         except Exception as e:
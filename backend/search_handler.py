@@ -1,12 +1,63 @@
 import aiohttp
 import asyncio
 import os
-from typing import List, Dict, Any
-from urllib.parse import urlparse
+import time
+from collections import OrderedDict
+import re
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Spam indicators checked against result domains
+_SPAM_KEYWORDS = (
+    'clickbait', 'viral', 'buzz', 'listicle', 'top10', 'bestof',
+    'casino', 'poker', 'gambling', 'betting', 'slots',
+    'dating', 'adult', 'xxx', 'porn', 'sex',
+    'freebie', 'coupon', 'deal', 'cheap', 'discount',
+    'scam', 'fake', 'fraud', 'spam', 'phishing',
+    'malware', 'virus', 'hack', 'crack', 'pirate',
+    'get-rich', 'make-money', 'earn-cash', 'free-money'
+)
+_SPAM_RE = re.compile('|'.join(map(re.escape, _SPAM_KEYWORDS)))
+
+# Suspicious TLDs (add more as needed)
+_BAD_TLD_RE = re.compile(r'\.(?:tk|ml|ga|cf)$')
+
+# Document types skipped by _filter_results; none is longer than 6 characters
+_BAD_EXTS = ('.pdf', '.doc', '.docx', '.xls', '.xlsx')
+
+def _fast_netloc(url: str) -> str:
+    """
+    Lower-cased network location of an absolute URL, sliced out of the string
+    without going through the urllib parser
+    """
+    return url.partition('://')[2].partition('/')[0].partition('?')[0].partition('#')[0].lower()
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection: treat http and https alike, lower-case
+    the host, drop default ports, fragments, tracking parameters and trailing slashes
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    
+    netloc = parts.netloc.lower()
+    if netloc.endswith((':80', ':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() != 'fbclid'
+    ])
+    
+    return urlunsplit((scheme, netloc, parts.path.rstrip('/'), query, ''))
+
 class SearchResult:
     def __init__(self, title: str, url: str, snippet: str, domain: str):
         self.title = title
@@ -18,27 +69,58 @@ class SearchHandler:
     def __init__(self):
         self.serpapi_key = os.getenv("SERPAPI_API_KEY")
         self.serpapi_endpoint = "https://serpapi.com/search"
+        self.query_timeout = 8  # Seconds before a single query is abandoned
+        
+        # SerpAPI responses keyed by (query, gl, hl, num); repeats skip the round-trip and quota
+        self.cache_ttl = 3600  # Seconds
+        self.cache_size = 512
+        self._cache: 'OrderedDict[Tuple[str, str, str, int], Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Lazily create the persistent SerpAPI session so its connection pool is reused
+        """
+        if self._session is None or self._session.closed:
+            # Every request goes to one host, so the per-host cap is the real
+            # limit; the total cap is lifted so it never serialises the fan-out
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """
+        Close the persistent session
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
     
     async def execute_searches(self, queries: List[Any]) -> List[SearchResult]:
         """
         Execute all search queries concurrently and return filtered results
         """
         
-        all_results = []
+        session = await self._get_session()
         
-        async with aiohttp.ClientSession() as session:
-            # Execute searches concurrently
-            tasks = [self._search_single_query(session, query) for query in queries]
-            search_responses = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            for i, response in enumerate(search_responses):
-                if isinstance(response, Exception):
-                    logger.error(f"Search failed for query {i}: {response}")
-                    continue
-                    
-                filtered_results = self._filter_results(response)
-                all_results.extend(filtered_results[:5])  # Top 5 per query
+        # Execute searches concurrently, filtering each response as soon as it
+        # arrives rather than waiting for the slowest query
+        tasks = [self._search_with_deadline(session, i, query) for i, query in enumerate(queries)]
+        filtered_by_query: List[List[SearchResult]] = [[] for _ in queries]
+        
+        for next_response in asyncio.as_completed(tasks):
+            i, response = await next_response
+            filtered_by_query[i] = self._filter_results(response)[:5]  # Top 5 per query
+        
+        # Keep query order so the dedup and the 15-result cap do not depend on timing
+        all_results = [result for results in filtered_by_query for result in results]
         
         # Remove duplicates and limit total results
         unique_results = self._deduplicate_results(all_results)
@@ -50,6 +132,21 @@ class SearchHandler:
         
         return unique_results[:15]  # Max 15 total results
     
+    async def _search_with_deadline(self, session: aiohttp.ClientSession, index: int, query: Any) -> Tuple[int, Dict[str, Any]]:
+        """
+        Run one query under query_timeout, tagging the response with the query's position
+        """
+        try:
+            response = await asyncio.wait_for(self._search_single_query(session, query), timeout=self.query_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Search timed out for query {index}: {query.query}")
+            response = {"organic_results": []}
+        except Exception as e:
+            logger.error(f"Search failed for query {index}: {e}")
+            response = {"organic_results": []}
+        
+        return index, response
+    
     async def _search_single_query(self, session: aiohttp.ClientSession, query: Any) -> Dict[str, Any]:
         """
         Execute a single SerpAPI search query - removed site filters for comprehensive search
@@ -63,13 +160,31 @@ class SearchHandler:
             "gl": "ca",  # Canada geolocation
             "hl": "en",  # English language
             "safe": "active",
-            "output": "json"
+            "output": "json",
+            # Only organic results are read; drop ads, knowledge graph, related
+            # questions and metadata from the response body
+            "json_restrictor": "organic_results"
         }
         
+        # Responses are treated as read-only downstream, so hits are returned as is
+        cache_key = (query.query, params["gl"], params["hl"], params["num"])
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            stored_at, data = cached
+            if time.monotonic() - stored_at < self.cache_ttl:
+                self._cache.move_to_end(cache_key)
+                logger.debug(f"SERPAPI CACHE HIT: {query.query}")
+                return data
+            del self._cache[cache_key]
+        
         try:
             async with session.get(self.serpapi_endpoint, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
+                    
+                    self._cache[cache_key] = (time.monotonic(), data)
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
                     
                     return data
                 else:
@@ -94,10 +209,11 @@ class SearchHandler:
             title = item.get("title", "")
             snippet = item.get("snippet", "")
             
-            # Parse domain
-            try:
-                domain = urlparse(url).netloc.lower()
-            except:
+            # Only web pages with a host are useful
+            if not url.startswith(('http://', 'https://')):
+                continue
+            domain = _fast_netloc(url)
+            if not domain:
                 continue
             
             # Skip low-quality domains
@@ -105,8 +221,8 @@ class SearchHandler:
                 logger.debug(f"Filtered out low-quality domain: {domain}")
                 continue
             
-            # Skip PDFs and non-web content for now
-            if url.lower().endswith(('.pdf', '.doc', '.docx', '.xls', '.xlsx')):
+            # Skip PDFs and non-web content for now; only the tail needs lower-casing
+            if url[-6:].lower().endswith(_BAD_EXTS):
                 logger.debug(f"Filtered out document: {url}")
                 continue
                 
@@ -120,40 +236,33 @@ class SearchHandler:
         # Return in Google's original ranking order (no re-sorting)
         return results
     
-    def _is_low_quality_domain(self, domain: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_low_quality_domain(domain: str) -> bool:
         """
         Filter out obvious spam/low-quality sites
         """
         domain = domain.lower()
         
-        # Spam indicators
-        spam_keywords = [
-            'clickbait', 'viral', 'buzz', 'listicle', 'top10', 'bestof',
-            'casino', 'poker', 'gambling', 'betting', 'slots',
-            'dating', 'adult', 'xxx', 'porn', 'sex',
-            'freebie', 'coupon', 'deal', 'cheap', 'discount',
-            'scam', 'fake', 'fraud', 'spam', 'phishing',
-            'malware', 'virus', 'hack', 'crack', 'pirate',
-            'get-rich', 'make-money', 'earn-cash', 'free-money'
-        ]
-        
         # Check for spam keywords in domain
-        if any(spam in domain for spam in spam_keywords):
+        if _SPAM_RE.search(domain):
             return True
         
-        # Check for suspicious patterns
-        suspicious_patterns = [
-            # Domains with excessive numbers
-            len([c for c in domain if c.isdigit()]) > len(domain) * 0.3,
-            # Domains with excessive hyphens
-            domain.count('-') > 3,
-            # Very short domains that are likely parked
-            len(domain.replace('.', '').replace('-', '')) < 4,
-            # Domains with suspicious TLDs (add more as needed)
-            any(domain.endswith(tld) for tld in ['.tk', '.ml', '.ga', '.cf'])
-        ]
-        
-        return any(suspicious_patterns)
+        # Check for suspicious patterns, cheapest first, stopping at the first hit
+        # Domains with excessive hyphens
+        if domain.count('-') > 3:
+            return True
+        
+        # Domains with suspicious TLDs
+        if _BAD_TLD_RE.search(domain):
+            return True
+        
+        # Very short domains that are likely parked
+        if len(domain) - domain.count('.') - domain.count('-') < 4:
+            return True
+        
+        # Domains with excessive numbers
+        return sum(map(str.isdigit, domain)) > len(domain) * 0.3
     
     def _deduplicate_results(self, results: List[SearchResult]) -> List[SearchResult]:
         """
@@ -162,22 +271,35 @@ class SearchHandler:
         logger.debug(f"DEDUPLICATION: Processing {len(results)} results")
         
         seen_urls = set()
-        seen_titles = set()
+        seen_title_words: List[frozenset] = []  # Token set of each kept title, built once
         unique_results = []
         
         for result in results:
-            # Skip exact URL duplicates
-            if result.url in seen_urls:
+            # Skip URL duplicates, comparing canonical forms; _filter_results only
+            # slices out the host, so a malformed link first fails here
+            try:
+                canonical_url = canonicalize_url(result.url)
+            except ValueError:
+                logger.debug(f"Filtered malformed URL: {result.url}")
+                continue
+            if canonical_url in seen_urls:
                 logger.debug(f"Filtered duplicate URL: {result.url}")
                 continue
                 
             # Skip very similar titles (basic deduplication)
-            title_words = set(result.title.lower().split())
+            title_words = frozenset(result.title.lower().split())
             is_similar = False
             
-            for seen_title in seen_titles:
-                seen_words = set(seen_title.lower().split())
-                if len(title_words & seen_words) / len(title_words | seen_words) > 0.8:
+            for seen_words in seen_title_words:
+                # Jaccard similarity is at most shorter/longer, so titles whose
+                # sizes differ by 20% or more can never exceed the threshold
+                if min(len(title_words), len(seen_words)) <= 0.8 * max(len(title_words), len(seen_words)):
+                    continue
+                
+                # The union size follows from the intersection
+                intersection = len(title_words & seen_words)
+                union = len(title_words) + len(seen_words) - intersection
+                if union and intersection / union > 0.8:
                     is_similar = True
                     logger.debug(f"Filtered similar title: {result.title}")
                     break
@@ -185,8 +307,8 @@ class SearchHandler:
             if is_similar:
                 continue
                 
-            seen_urls.add(result.url)
-            seen_titles.add(result.title)
+            seen_urls.add(canonical_url)
+            seen_title_words.append(title_words)
             unique_results.append(result)
         
         logger.info(f"DEDUPLICATION: {len(unique_results)} unique results from {len(results)} total")
@@ -1,198 +1,782 @@
 import openai
 import os
-from typing import List, Dict, Any
+import orjson
+import tiktoken
+from typing import List, Dict, Any, Optional, Iterator, FrozenSet
 import asyncio
 import logging
-from datetime import datetime
-from pydantic import BaseModel
+import re
+from string import Template
+import math
+import time
+from collections import Counter
+from itertools import chain, zip_longest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from aiolimiter import AsyncLimiter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from pydantic import BaseModel, Field
+from summary_cache import SummaryCache
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries and words for the local extractive summary and point shingles
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+_WORD_RE = re.compile(r'\w+')
+
+# One complete JSON string in an array, with its leading separator
+_JSON_ITEM_RE = re.compile(r'\s*,?\s*("(?:[^"\\]|\\.)*")')
+
+
+# Output budget per requested point: ~1-2 sentence bullets, the 2-3 sentence
+# synthesis bullets, and the JSON wrapper around a response
+_TOKENS_PER_BULLET = 45
+_TOKENS_PER_SYNTHESIS_BULLET = 80
+_JSON_OVERHEAD_TOKENS = 40
+
+# Bump when a prompt changes so cached summaries from the old wording are not reused
+PROMPT_VERSION = "v1"
+
+_SUMMARY_SYSTEM_PROMPT = "You are an expert policy analyst who creates concise, factual summaries for government document drafters. Focus on specific facts, figures, and actionable information. Always return valid JSON."
+
+_CONSOLIDATE_SYSTEM_PROMPT = "You consolidate multiple summaries into the most important key points. Always return valid JSON."
+
+_SYNTHESIS_SYSTEM_PROMPT = "You are a senior policy analyst creating executive-level summaries for government document drafters. Focus on synthesis, themes, and actionable insights. Always return valid JSON."
+
+_BATCH_PROMPT = Template("""
+Summarize each of the following $count government/policy documents into exactly 3-4 bullet points.
+
+Focus on:
+- Key facts, figures, and statistics
+- Policy decisions or recommendations  
+- Government initiatives or programs
+- Relevant dates and timelines
+- Actionable information for government document drafting
+
+Each bullet point should be 1-2 sentences and contain specific, factual information.
+
+$documents
+
+Return JSON of the form {"0": ["..."], "1": ["..."]} with one entry per source, keyed by its SOURCE number.
+""")
+
+_CHUNK_PROMPT = Template("""
+Summarize the following government/policy document into exactly 3-4 bullet points.
+
+Document Title: $title
+Source Domain: $domain
+
+Focus on:
+- Key facts, figures, and statistics
+- Policy decisions or recommendations  
+- Government initiatives or programs
+- Relevant dates and timelines
+- Actionable information for government document drafting
+
+Each bullet point should be 1-2 sentences and contain specific, factual information.
+
+Text to summarize:
+$text
+
+Return JSON of the form {"bullets": ["..."]} with exactly 3-4 entries.
+""")
+
+_MULTI_CHUNK_PROMPT = Template("""
+The following government/policy document has been split into $count numbered sections.
+
+Document Title: $title
+Source Domain: $domain
+
+First list 2-3 key points for each section, then consolidate them into exactly 3-4 key bullet points for the whole document.
+
+Focus on:
+- Key facts, figures, and statistics
+- Policy decisions or recommendations  
+- Government initiatives or programs
+- Relevant dates and timelines
+- Actionable information for government document drafting
+
+Each point should be 1-2 sentences and contain specific, factual information.
+
+$sections
+
+Return JSON of the form {"chunks": [{"points": ["..."]}], "consolidated": ["..."]} with one "chunks" entry per section, in order.
+""")
+
+_CONSOLIDATE_PROMPT = Template("""
+The following bullet points are summaries from different sections of the same document: "$title"
+
+Consolidate these into exactly 3-4 key bullet points that capture the most important information:
+
+$combined_text
+
+Return JSON of the form {"bullets": ["..."]} with exactly 3-4 entries.
+""")
+
+_SYNTHESIS_PROMPT = Template("""
+Create a unified synthesis for a government document on the following:
+- Subject: $subject
+- Purpose: $purpose
+
+Based on these research findings from multiple sources:
+
+$combined_summaries
+
+Synthesize this information into exactly 5-7 bullet points that:
+1. Group related themes together
+2. Highlight the most relevant facts and figures
+3. Focus on actionable insights for government document drafting
+4. Maintain factual accuracy
+5. Prioritize recent developments and official government positions
+
+Each bullet point should be 2-3 sentences and provide specific, useful information.
+
+Return JSON of the form {"bullets": ["..."]} with exactly 5-7 entries.
+""")
+
+
+# One OpenAI client per process so every Summarizer shares its keep-alive pool;
+# closed by the app lifespan
+_CLIENT = openai.AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=openai.DefaultAioHttpClient(),
+    timeout=openai.Timeout(60, connect=5),
+    max_retries=0  # Retries are handled by Summarizer._create_completion
+)
+
+
+def _normalize_source_text(text: str) -> str:
+    """
+    Drop repeated sentences (page furniture repeated through a document) before
+    text is sent to the LLM; citations and whitespace are already cleaned by
+    ContentExtractor._clean_text
+    """
+    seen = set()
+    kept = []
+    for sentence in _SENTENCE_END_RE.split(text):
+        key = sentence.lower()
+        # Short repeats ("Yes.", "Note:") are left alone
+        if key in seen and len(sentence.split()) >= 4:
+            continue
+        seen.add(key)
+        kept.append(sentence)
+    return ' '.join(kept)
+
+
+def _shingles(text: str, size: int = 5) -> FrozenSet[tuple]:
+    """
+    Word n-grams of the normalized text; shorter texts are a single shingle
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def _distinct_points(source_summaries: List["SourceSummary"], threshold: float = 0.8) -> Iterator[str]:
+    """
+    Yield each summary point tagged with its domain, skipping points whose
+    5-gram Jaccard similarity to an already yielded point exceeds threshold
+    """
+    kept: List[FrozenSet[tuple]] = []
+    for source in source_summaries:
+        for point in source.source_summary:
+            shingles = _shingles(point)
+            is_duplicate = False
+            for seen in kept:
+                # Jaccard similarity is at most smaller/larger, so skip pairs that can't pass
+                if min(len(shingles), len(seen)) <= threshold * max(len(shingles), len(seen)):
+                    continue
+                intersection = len(shingles & seen)
+                if intersection / (len(shingles) + len(seen) - intersection) > threshold:
+                    is_duplicate = True
+                    break
+            
+            if is_duplicate:
+                continue
+            kept.append(shingles)
+            yield f"[{source.domain}] {point}"
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time as an ISO 8601 string with second precision
+    """
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
 class SourceSummary(BaseModel):
     title: str
     url: str
     source_summary: List[str]
     domain: str
-    date_accessed: str
+    date_accessed: str = Field(default_factory=_utc_timestamp)
 
 class Summarizer:
+    # Tokenizer shared by all instances; loaded once at startup by load_encoding
+    _encoding = None
+    
+    @classmethod
+    def load_encoding(cls):
+        """
+        Load the gpt-4o-mini tokenizer, which downloads its BPE file on first
+        use. Chunking falls back to a character split if it can't be loaded.
+        """
+        try:
+            cls._encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+        except Exception as e:
+            logger.warning("Tokenizer unavailable, chunking by characters: %s", e)
+    
     def __init__(self):
-        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.max_chunk_size = 4000  # Characters per chunk for GPT-4o-mini
+        self.client = _CLIENT
+        self.max_chunk_tokens = 8000  # Tokens per chunk for GPT-4o-mini
+        self.chunk_overlap_tokens = 150  # Shared between neighbouring chunks so boundary sentences keep context
+        # Multi-chunk sources up to this size are summarized in one request;
+        # leaves headroom in the 128k context for the prompt and the answer
+        self.max_single_request_tokens = 120_000
+        # Cap on in-flight OpenAI requests across all sources and chunks
+        self.openai_concurrency = 20
+        self._openai_semaphore = asyncio.Semaphore(self.openai_concurrency)
+        # Token buckets for the account's requests- and tokens-per-minute budgets
+        self.openai_rpm = 500
+        self.openai_tpm = 200_000
+        self._limiter = AsyncLimiter(self.openai_rpm, 60)
+        self._token_limiter = AsyncLimiter(self.openai_tpm, 60)
+        # After a 429, requests cost double against both buckets until this time
+        self.rate_limit_backoff = 10  # Seconds
+        self._throttled_until = 0.0
+        # Persistent summaries keyed by model and prompt inputs
+        self.cache = SummaryCache()
+        # Sources shorter than this are summarized locally from their key sentences
+        self.local_summary_words = 150
+        # Sources shorter than this are packed several to a request
+        self.batch_word_threshold = 600
+        self.batch_max_sources = 8
+        self.batch_max_words = 4000
+        # Syntheses over more sources than this are split into concurrent groups
+        self.synthesis_group_size = 10
+        # Chunk summaries in progress keyed by chunk cache key, so identical chunks
+        # requested concurrently share one call; entries leave when they finish
+        self._inflight: Dict[str, asyncio.Task] = {}
         
     async def summarize_sources(self, extracted_content: List[Any]) -> List[SourceSummary]:
         """
-        Summarize each source individually into 3-4 bullet points
+        Summarize each source into 3-4 bullet points
         """
         # ADD: Input logging
-        logger.info(f"SUMMARIZER INPUT - {len(extracted_content)} sources to summarize:")
-        for i, content in enumerate(extracted_content):
-            logger.info(f"  {i+1}. [{content.domain}] {content.word_count} words - {content.title}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("SUMMARIZER INPUT - %s sources to summarize:", len(extracted_content))
+            for i, content in enumerate(extracted_content):
+                logger.info("  %d. [%s] %d words - %s", i + 1, content.domain, content.word_count, content.title)
         
-        source_summaries = []
+        # One access timestamp shared by every summary in this run
+        accessed_at = _utc_timestamp()
         
-        # Process sources concurrently (in batches to avoid rate limits)
-        batch_size = 5
-        for i in range(0, len(extracted_content), batch_size):
-            batch = extracted_content[i:i + batch_size]
-            
-            logger.info(f"PROCESSING BATCH {i//batch_size + 1}: {len(batch)} sources")
-            
-            tasks = [self._summarize_single_source(content) for content in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, SourceSummary):
-                    source_summaries.append(result)
-                elif isinstance(result, Exception):
-                    logger.error(f"Source summarization failed: {result}")
-            
-            # Small delay between batches to respect rate limits
-            if i + batch_size < len(extracted_content):
-                await asyncio.sleep(1)
+        # Read the sizes once and sort once; batching and dispatch order both use them
+        word_counts = [content.word_count for content in extracted_content]
+        shortest_first = sorted(range(len(word_counts)), key=word_counts.__getitem__)
+        
+        ordered: List[Optional[SourceSummary]] = [None] * len(extracted_content)
+        
+        # Very short sources are already summary-sized; their key sentences need no LLM call
+        for index in shortest_first:
+            if word_counts[index] >= self.local_summary_words:
+                break
+            content = extracted_content[index]
+            points = self._local_summarize(content.content)
+            if points:
+                ordered[index] = SourceSummary(
+                    title=content.title,
+                    url=content.url,
+                    source_summary=points,
+                    domain=content.domain,
+                    date_accessed=accessed_at
+                )
+        pending = [index for index in shortest_first if ordered[index] is None]
+        
+        # Short sources share requests; everything else is summarized on its own,
+        # longest first so the slowest requests are not the last to start
+        batches = self._batch_short_sources(word_counts, pending)
+        batched = {index for batch in batches for index in batch}
+        slots = [[index] for index in reversed(pending) if index not in batched] + batches
+        
+        # Process all requests concurrently; the shared OpenAI semaphore and
+        # rate limiters keep in-flight requests within the account limits
+        tasks = [
+            self._summarize_source_batch([extracted_content[index] for index in slot], accessed_at)
+            if len(slot) > 1 else self._summarize_single_source(extracted_content[slot[0]], accessed_at)
+            for slot in slots
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Put summaries back in source order
+        for slot, result in zip(slots, results):
+            if isinstance(result, Exception):
+                logger.error("Source summarization failed: %s", result)
+                continue
+            for index, summary in zip(slot, result if isinstance(result, list) else [result]):
+                ordered[index] = summary
+        source_summaries = [summary for summary in ordered if summary is not None]
         
         # ADD: Output logging
-        logger.info(f"SUMMARIZER OUTPUT - {len(source_summaries)} source summaries:")
-        for i, summary in enumerate(source_summaries):
-            logger.info(f"  {i+1}. [{summary.domain}] {len(summary.source_summary)} points - {summary.title} - {content}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("SUMMARIZER OUTPUT - %s source summaries:", len(source_summaries))
+            for i, summary in enumerate(source_summaries):
+                logger.info("  %d. [%s] %d points - %s", i + 1, summary.domain, len(summary.source_summary), summary.title)
+            logger.info("SUMMARY CACHE: %s", self.cache.stats())
         
         return source_summaries
     
-    async def _summarize_single_source(self, content: Any) -> SourceSummary:
+    async def _summarize_single_source(self, content: Any, accessed_at: Optional[str] = None) -> SourceSummary:
         """
         Summarize a single source using GPT-4o-mini
         """
         
+        accessed_at = accessed_at or _utc_timestamp()
+        
         try:
             # Chunk content if too long
             chunks = self._chunk_content(content.content)
             
-            logger.debug(f"CONTENT CHUNKS: {len(chunks)} chunks for {content.url}")
+            logger.debug("CONTENT CHUNKS: %s chunks for %s", len(chunks), content.url)
             
             if len(chunks) == 1:
                 summary_points = await self._summarize_chunk(chunks[0], content.title, content.domain)
             else:
-                # Summarize each chunk then combine
-                chunk_summaries = []
-                for j, chunk in enumerate(chunks):
-                    logger.debug(f"PROCESSING CHUNK {j+1}/{len(chunks)} for {content.url}")
-                    chunk_summary = await self._summarize_chunk(chunk, content.title, content.domain)
-                    chunk_summaries.extend(chunk_summary)
+                summary_points = None
+                
+                # One structured request covering every chunk instead of one
+                # request per chunk plus a consolidation request
+                if len(chunks) * self.max_chunk_tokens <= self.max_single_request_tokens:
+                    summary_points = await self._summarize_chunks_together(chunks, content.title, content.domain)
                 
-                # Consolidate chunk summaries
-                summary_points = await self._consolidate_summaries(chunk_summaries, content.title)
+                if not summary_points:
+                    # Summarize every chunk concurrently then combine
+                    logger.debug("PROCESSING %s CHUNKS for %s", len(chunks), content.url)
+                    chunk_results = await asyncio.gather(
+                        *[self._summarize_chunk(chunk, content.title, content.domain) for chunk in chunks]
+                    )
+                    
+                    # Drop repeated points, taking chunks in turn so every section is represented
+                    seen = set()
+                    chunk_summaries = []
+                    for point in chain.from_iterable(zip_longest(*chunk_results)):
+                        if point is not None and point.lower() not in seen:
+                            seen.add(point.lower())
+                            chunk_summaries.append(point)
+                    
+                    # Consolidate chunk summaries unless they are already few enough to use as-is
+                    if len(chunks) <= 2 or len(chunk_summaries) <= 4:
+                        summary_points = chunk_summaries[:4]
+                    else:
+                        summary_points = await self._consolidate_summaries(chunk_summaries, content.title)
             
-            logger.info(f"SUMMARIZED SOURCE: [{content.domain}] {len(summary_points)} points")
-            for i, point in enumerate(summary_points):
-                logger.debug(f"  {i+1}. {point}")
+            logger.info("SUMMARIZED SOURCE: [%s] %s points", content.domain, len(summary_points))
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, point in enumerate(summary_points):
+                    logger.debug("  %d. %s", i + 1, point)
             
             return SourceSummary(
                 title=content.title,
                 url=content.url,
                 source_summary=summary_points,
                 domain=content.domain,
-                date_accessed=datetime.utcnow().isoformat()
+                date_accessed=accessed_at
             )
             
         except Exception as e:
-            logger.error(f"Error summarizing source {content.url}: {e}")
+            logger.error("Error summarizing source %s: %s", content.url, e)
             # Return fallback summary
             return SourceSummary(
                 title=content.title,
                 url=content.url,
                 source_summary=[f"Summary unavailable - processing error"],
                 domain=content.domain,
-                date_accessed=datetime.utcnow().isoformat()
+                date_accessed=accessed_at
             )
     
-    async def _summarize_chunk(self, text: str, title: str, domain: str) -> List[str]:
+    @staticmethod
+    def _local_summarize(text: str, max_points: int = 4) -> Optional[List[str]]:
         """
-        Summarize a text chunk into bullet points
+        Extractive summary: the sentences with the highest mean TF-IDF weight, in
+        document order. Returns None when there are too few sentences to choose from.
         """
-        logger.debug(f"SUMMARIZING CHUNK: {len(text)} chars from {domain}")
+        sentences = [sentence.strip() for sentence in _SENTENCE_END_RE.split(text) if len(sentence.split()) >= 5]
+        if len(sentences) < 3:
+            return None
         
-        prompt = f"""
-Summarize the following government/policy document into exactly 3-4 bullet points.
-
-Document Title: {title}
-Source Domain: {domain}
-
-Focus on:
-- Key facts, figures, and statistics
-- Policy decisions or recommendations  
-- Government initiatives or programs
-- Relevant dates and timelines
-- Actionable information for government document drafting
-
-Each bullet point should be 1-2 sentences and contain specific, factual information.
-
-Text to summarize:
-{text}
-
-Return only the bullet points, starting each with "•":
-"""
+        sentence_words = [_WORD_RE.findall(sentence.lower()) for sentence in sentences]
+        document_frequency = Counter(word for words in sentence_words for word in set(words))
+        idf = {word: math.log(len(sentences) / count) for word, count in document_frequency.items()}
+        
+        scores = [
+            sum(count * idf[word] for word, count in Counter(words).items()) / len(words) if words else 0.0
+            for words in sentence_words
+        ]
+        top = sorted(range(len(sentences)), key=scores.__getitem__, reverse=True)[:max_points]
+        return [sentences[i] for i in sorted(top)]
+    
+    def _batch_short_sources(self, word_counts: List[int], shortest_first: List[int]) -> List[List[int]]:
+        """
+        Group the indices of short sources into batches bounded by source count
+        and total words; returns only batches of two or more. Sources are taken
+        shortest first so each batch holds similarly sized documents.
+        """
+        batches = []
+        current: List[int] = []
+        current_words = 0
+        
+        for index in shortest_first:
+            words = word_counts[index]
+            if words >= self.batch_word_threshold:
+                break
+            full = len(current) >= self.batch_max_sources
+            if current and (full or current_words + words > self.batch_max_words):
+                batches.append(current)
+                current, current_words = [], 0
+            current.append(index)
+            current_words += words
+        
+        if current:
+            batches.append(current)
+        return [batch for batch in batches if len(batch) > 1]
+    
+    async def _summarize_source_batch(self, contents: List[Any], accessed_at: str) -> List[SourceSummary]:
+        """
+        Summarize several short sources, sending the uncached ones in a single
+        request; sources missing from the reply are summarized individually
+        """
+        texts = [_normalize_source_text(content.content) for content in contents]
+        cache_keys = [self._chunk_cache_key(text, content.title, content.domain) for text, content in zip(texts, contents)]
+        summaries: List[Optional[List[str]]] = [self.cache.get(key) for key in cache_keys]
+        missing = [i for i, points in enumerate(summaries) if points is None]
+        
+        if len(missing) > 1:
+            batch_points = await self._summarize_batch_request([contents[i] for i in missing], [texts[i] for i in missing])
+            for i, points in zip(missing, batch_points):
+                if points:
+                    if len(points) >= 3:
+                        self.cache.set(cache_keys[i], points[:4])
+                    summaries[i] = self._fit_chunk_points(points, contents[i].domain)
+        
+        retry = [i for i, points in enumerate(summaries) if points is None]
+        retry_points = await asyncio.gather(
+            *[self._summarize_chunk(texts[i], contents[i].title, contents[i].domain) for i in retry]
+        )
+        for i, points in zip(retry, retry_points):
+            summaries[i] = points
+        
+        logger.info(
+            "SUMMARIZED BATCH: %s sources, %s uncached, %s sent individually",
+            len(contents), len(missing), len(retry)
+        )
+        return [
+            SourceSummary(
+                title=content.title,
+                url=content.url,
+                source_summary=points,
+                domain=content.domain,
+                date_accessed=accessed_at
+            )
+            for content, points in zip(contents, summaries)
+        ]
+    
+    async def _summarize_batch_request(self, contents: List[Any], texts: List[str]) -> List[Optional[List[str]]]:
+        """
+        Summarize several documents (texts, with titles and domains from contents)
+        in one JSON-mode request; returns each document's bullet points in input
+        order, or None where the reply lacks them
+        """
+        documents = "\n\n".join(
+            f"---SOURCE {i}---\nDocument Title: {content.title}\nSource Domain: {content.domain}\n\n{text}"
+            for i, (content, text) in enumerate(zip(contents, texts))
+        )
+        
+        prompt = _BATCH_PROMPT.substitute(count=len(contents), documents=documents)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are an expert policy analyst who creates concise, factual summaries for government document drafters. Focus on specific facts, figures, and actionable information."},
+                    {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
+                response_format={"type": "json_object"},
                 temperature=0.3,
-                max_tokens=400
+                max_tokens=4 * len(contents) * _TOKENS_PER_BULLET + _JSON_OVERHEAD_TOKENS
             )
             
-            content = response.choices[0].message.content.strip()
+            content = response.choices[0].message.content
             
-            # ADD: Raw LLM output logging
-            logger.debug(f"CHUNK SUMMARY LLM_OUTPUT: {content}")
+            logger.debug("BATCH SUMMARY LLM_OUTPUT: %s", content)
+            
+            data = orjson.loads(content)
+            results = []
+            for i in range(len(contents)):
+                points = data.get(str(i))
+                if isinstance(points, list):
+                    points = [point.strip() for point in points if isinstance(point, str) and point.strip()]
+                results.append(points or None)
+            return results
+            
+        except Exception as e:
+            logger.error("Batch summarization error: %s", e)
+            return [None] * len(contents)
+    
+    @asynccontextmanager
+    async def _rate_limited(self, request: Dict[str, Any]):
+        """
+        Hold a concurrency slot and draw the request's share of the requests- and
+        tokens-per-minute buckets; a rate-limit error halves both rates for a while
+        """
+        # ~4 characters per prompt token, plus the completion budget
+        estimated_tokens = sum(len(message["content"]) for message in request["messages"]) // 4
+        estimated_tokens += request.get("max_tokens", 0)
+        weight = 2 if time.monotonic() < self._throttled_until else 1
+        
+        async with self._openai_semaphore:
+            await self._limiter.acquire(weight)
+            await self._token_limiter.acquire(min(estimated_tokens * weight, self.openai_tpm))
+            try:
+                yield
+            except openai.RateLimitError:
+                self._throttled_until = time.monotonic() + self.rate_limit_backoff
+                logger.warning("OpenAI rate limit hit; halving request rate for %ss", self.rate_limit_backoff)
+                raise
+    
+    @retry(
+        wait=wait_exponential_jitter(1, 60),
+        stop=stop_after_attempt(5),
+        retry=retry_if_exception_type((openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)),
+        reraise=True
+    )
+    async def _create_completion(self, **kwargs):
+        """
+        Issue a chat completion within the shared OpenAI rate limits, retrying
+        rate-limit, 5xx and network errors (timeouts included) with jittered
+        exponential backoff; each attempt waits for its own rate-limit slot
+        """
+        async with self._rate_limited(kwargs):
+            return await self.client.chat.completions.create(**kwargs)
+    
+    async def _stream_bullets(self, max_bullets: int, **kwargs) -> List[str]:
+        """
+        Stream a JSON-mode completion of the form {"bullets": [...]} and stop
+        reading once max_bullets complete entries have arrived
+        """
+        kwargs["response_format"] = {"type": "json_object"}
+        try:
+            async with self._rate_limited(kwargs):
+                stream = await self.client.chat.completions.create(stream=True, **kwargs)
+                buffer = ""
+                position = -1  # Just past the last complete entry, once the array has opened
+                bullets = []
+                stopped_early = False
+                try:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if not delta:
+                            continue
+                        buffer += delta
+                        
+                        if position < 0:
+                            array_start = buffer.find('[')
+                            if array_start < 0:
+                                continue
+                            position = array_start + 1
+                        
+                        # Take every entry whose closing quote has arrived
+                        while match := _JSON_ITEM_RE.match(buffer, position):
+                            bullets.append(orjson.loads(match.group(1)))
+                            position = match.end()
+                        if len(bullets) >= max_bullets:
+                            stopped_early = True
+                            break
+                finally:
+                    await stream.close()
+                
+                # A complete response is parsed whole in case it isn't a plain string array;
+                # one cut off at max_tokens keeps the entries that did arrive
+                if not stopped_early:
+                    try:
+                        bullets = self._parse_bullets(buffer)
+                    except orjson.JSONDecodeError:
+                        if not bullets:
+                            raise
+        except openai.APIError as e:
+            logger.warning("Streaming completion failed, retrying without streaming: %s", e)
+            response = await self._create_completion(**kwargs)
+            bullets = self._parse_bullets(response.choices[0].message.content)
+        
+        return [point.strip() for point in bullets if isinstance(point, str) and point.strip()]
+    
+    @staticmethod
+    def _parse_bullets(content: str) -> List[Any]:
+        """
+        The "bullets" list from a JSON-mode response
+        """
+        bullets = orjson.loads(content).get("bullets", [])
+        return bullets if isinstance(bullets, list) else []
+    
+    async def _summarize_chunk(self, text: str, title: str, domain: str) -> List[str]:
+        """
+        Summarize a text chunk into bullet points, joining an identical chunk's
+        request if one is already in flight
+        """
+        # Keyed like the disk cache: the prompt, fallback and padding all name the source
+        cache_key = self._chunk_cache_key(text, title, domain)
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._summarize_chunk_request(text, title, domain, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            logger.debug("CHUNK ALREADY IN FLIGHT: %s chars from %s", len(text), domain)
+        
+        # Shielded so one caller being cancelled doesn't cancel the others' result
+        return list(await asyncio.shield(task))
+    
+    async def _summarize_chunk_request(self, text: str, title: str, domain: str, cache_key: str) -> List[str]:
+        """
+        Summarize a text chunk into bullet points; cache_key is the chunk's
+        _chunk_cache_key, already computed by _summarize_chunk
+        """
+        logger.debug("SUMMARIZING CHUNK: %s chars from %s", len(text), domain)
+        
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = _CHUNK_PROMPT.substitute(title=title, domain=domain, text=text)
+
+        try:
+            bullet_points = await self._stream_bullets(
+                4,
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=4 * _TOKENS_PER_BULLET + _JSON_OVERHEAD_TOKENS
+            )
             
-            # Extract bullet points
-            bullet_points = []
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                    bullet_points.append(line[1:].strip())
-                elif len(line) > 20 and not any(line.startswith(prefix) for prefix in ['Here are', 'Summary:', 'Key points:']):
-                    bullet_points.append(line)
+            # ADD: Raw LLM output logging
+            logger.debug("CHUNK SUMMARY LLM_OUTPUT: %s", bullet_points)
             
-            # Ensure we have 3-4 points
-            if len(bullet_points) < 3:
-                bullet_points.extend([f"Additional context from {domain}"] * (3 - len(bullet_points)))
-            elif len(bullet_points) > 4:
-                bullet_points = bullet_points[:4]
+            # Only a complete answer is cached; padding is applied on the way out
+            if len(bullet_points) >= 3:
+                self.cache.set(cache_key, bullet_points[:4])
+            bullet_points = self._fit_chunk_points(bullet_points, domain)
             
-            logger.debug(f"CHUNK SUMMARY OUTPUT: {len(bullet_points)} points")
+            logger.debug("CHUNK SUMMARY OUTPUT: %s points", len(bullet_points))
             return bullet_points
             
         except Exception as e:
-            logger.error(f"Chunk summarization error: {e}")
+            logger.error("Chunk summarization error: %s", e)
             return [f"Summary unavailable for content from {domain}"]
     
-    def _chunk_content(self, content: str) -> List[str]:
+    @staticmethod
+    def _chunk_cache_key(text: str, title: str, domain: str) -> str:
+        return SummaryCache.make_key(
+            "gpt-4o-mini", PROMPT_VERSION, "chunk", title, domain, text
+        )
+    
+    @staticmethod
+    def _fit_chunk_points(bullet_points: List[str], domain: str) -> List[str]:
         """
-        Split content into chunks for processing
+        Ensure we have 3-4 points
         """
-        if len(content) <= self.max_chunk_size:
-            return [content]
+        if len(bullet_points) < 3:
+            return bullet_points + [f"Additional context from {domain}"] * (3 - len(bullet_points))
+        return bullet_points[:4]
+    
+    async def _summarize_chunks_together(self, chunks: List[str], title: str, domain: str) -> Optional[List[str]]:
+        """
+        Summarize every chunk of a document and consolidate the result in a single
+        JSON-mode request. Returns None if the response is unusable.
+        """
+        logger.debug("SUMMARIZING %s CHUNKS IN ONE REQUEST from %s", len(chunks), domain)
         
-        chunks = []
-        sentences = content.split('. ')
-        current_chunk = ""
+        cache_key = SummaryCache.make_key(
+            "gpt-4o-mini", PROMPT_VERSION, "chunks", title, domain, *chunks
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) + 2 <= self.max_chunk_size:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
+        sections = "\n\n".join(f"--- Section {i+1} ---\n{chunk}" for i, chunk in enumerate(chunks))
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        prompt = _MULTI_CHUNK_PROMPT.substitute(count=len(chunks), title=title, domain=domain, sections=sections)
+
+        try:
+            response = await self._create_completion(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=(3 * len(chunks) + 4) * _TOKENS_PER_BULLET + _JSON_OVERHEAD_TOKENS
+            )
+            
+            content = response.choices[0].message.content
+            
+            logger.debug("MULTI-CHUNK SUMMARY LLM_OUTPUT: %s", content)
+            
+            data = orjson.loads(content)
+            consolidated = [str(point).strip() for point in data.get("consolidated", []) if str(point).strip()]
+            
+            # Fall back to the per-section points if the consolidation is missing
+            if not consolidated:
+                consolidated = [
+                    str(point).strip()
+                    for chunk in data.get("chunks", []) if isinstance(chunk, dict)
+                    for point in chunk.get("points", []) if str(point).strip()
+                ]
+            
+            logger.debug("MULTI-CHUNK SUMMARY OUTPUT: %s points", len(consolidated))
+            # Only a complete answer is cached
+            if len(consolidated) >= 3:
+                self.cache.set(cache_key, consolidated[:4])
+            return consolidated[:4] or None
+            
+        except Exception as e:
+            logger.error("Multi-chunk summarization error: %s", e)
+            return None
+    
+    def _chunk_content(self, content: str) -> List[str]:
+        """
+        Normalize content and split it into overlapping chunks of at most
+        max_chunk_tokens tokens
+        """
+        content = _normalize_source_text(content)
+        
+        encoding = Summarizer._encoding
+        if encoding is None:
+            # No tokenizer: ~4 characters per token
+            size = self.max_chunk_tokens * 4
+            overlap = self.chunk_overlap_tokens * 4
+            if len(content) <= size:
+                return [content]
+            return [
+                content[i:i + size].strip()
+                for i in range(0, len(content) - overlap, size - overlap)
+            ]
+        
+        token_ids = encoding.encode(content)
+        if len(token_ids) <= self.max_chunk_tokens:
+            return [content]
         
-        return chunks
+        size = self.max_chunk_tokens
+        step = size - self.chunk_overlap_tokens
+        return [
+            encoding.decode(token_ids[i:i + size]).strip()
+            for i in range(0, len(token_ids) - self.chunk_overlap_tokens, step)
+        ]
     
     async def _consolidate_summaries(self, chunk_summaries: List[str], title: str) -> List[str]:
         """
@@ -200,45 +784,41 @@ Return only the bullet points, starting each with "•":
         """
         combined_text = "\n".join(chunk_summaries)
         
-        logger.debug(f"CONSOLIDATING SUMMARIES: {len(chunk_summaries)} summaries for {title}")
+        logger.debug("CONSOLIDATING SUMMARIES: %s summaries for %s", len(chunk_summaries), title)
         
-        prompt = f"""
-The following bullet points are summaries from different sections of the same document: "{title}"
-
-Consolidate these into exactly 3-4 key bullet points that capture the most important information:
-
-{combined_text}
-
-Return only the consolidated bullet points, starting each with "•":
-"""
+        cache_key = SummaryCache.make_key("gpt-4o-mini", PROMPT_VERSION, "consolidate", title, *sorted(chunk_summaries))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = _CONSOLIDATE_PROMPT.substitute(title=title, combined_text=combined_text)
 
         try:
-            response = await self.client.chat.completions.create(
+            bullet_points = await self._stream_bullets(
+                4,
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You consolidate multiple summaries into the most important key points."},
+                    {"role": "system", "content": _CONSOLIDATE_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.2,
-                max_tokens=300
+                max_tokens=4 * _TOKENS_PER_BULLET + _JSON_OVERHEAD_TOKENS
             )
             
-            content = response.choices[0].message.content.strip()
-            
             # ADD: Raw LLM output logging
-            logger.debug(f"CONSOLIDATION LLM_OUTPUT: {content}")
+            logger.debug("CONSOLIDATION LLM_OUTPUT: %s", bullet_points)
             
-            bullet_points = []
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                    bullet_points.append(line[1:].strip())
+            logger.debug("CONSOLIDATION OUTPUT: %s points", len(bullet_points))
+            if not bullet_points:
+                return chunk_summaries[:4]
             
-            logger.debug(f"CONSOLIDATION OUTPUT: {len(bullet_points)} points")
-            return bullet_points[:4] if bullet_points else chunk_summaries[:4]
+            # Only a complete answer is cached; a reply cut off at max_tokens is not
+            if len(bullet_points) >= 3:
+                self.cache.set(cache_key, bullet_points[:4])
+            return bullet_points[:4]
             
         except Exception as e:
-            logger.error(f"Summary consolidation error: {e}")
+            logger.error("Summary consolidation error: %s", e)
             return chunk_summaries[:4]
     
     async def synthesize_summary(self, source_summaries: List[SourceSummary], subject: str, purpose: str) -> List[str]:
@@ -249,76 +829,48 @@ Return only the consolidated bullet points, starting each with "•":
         if not source_summaries:
             return ["No relevant sources found for analysis."]
         
-        # Combine all source summaries
-        all_points = []
-        for source in source_summaries:
-            for point in source.source_summary:
-                all_points.append(f"[{source.domain}] {point}")
-        
-        combined_summaries = "\n".join(all_points)
-        
-        logger.debug(f"SYNTHESIS COMBINED INPUT: {len(all_points)} total points from {len(source_summaries)} sources")
-        
-        prompt = f"""
-Create a unified synthesis for a government document on the following:
-- Subject: {subject}
-- Purpose: {purpose}
-
-Based on these research findings from multiple sources:
-
-{combined_summaries}
-
-Synthesize this information into exactly 5-7 bullet points that:
-1. Group related themes together
-2. Highlight the most relevant facts and figures
-3. Focus on actionable insights for government document drafting
-4. Maintain factual accuracy
-5. Prioritize recent developments and official government positions
-
-Each bullet point should be 2-3 sentences and provide specific, useful information.
-
-Return only the bullet points, starting each with "•":
-"""
-
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a senior policy analyst creating executive-level summaries for government document drafters. Focus on synthesis, themes, and actionable insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                max_tokens=600
-            )
+            findings = source_summaries
             
-            content = response.choices[0].message.content.strip()
-            
-            # ADD: Raw LLM output logging
-            logger.info(f"SYNTHESIS LLM_OUTPUT: {content}")
+            # Map-reduce large result sets: synthesize groups of sources concurrently,
+            # then synthesize the group syntheses
+            if len(findings) > self.synthesis_group_size:
+                size = self.synthesis_group_size
+                groups = [findings[i:i + size] for i in range(0, len(findings), size)]
+                partials = await asyncio.gather(
+                    *[self._synthesize_partial(group, subject, purpose) for group in groups],
+                    return_exceptions=True
+                )
+                
+                findings = []
+                for i, (group, points) in enumerate(zip(groups, partials)):
+                    if isinstance(points, Exception):
+                        logger.error("Partial synthesis error: %s", points)
+                        continue
+                    if points:
+                        label = f"sources {i * size + 1}-{i * size + len(group)}"
+                        findings.append(SourceSummary(title=label, url="", source_summary=points, domain=label))
+                
+                logger.debug("SYNTHESIS MAP: %s groups reduced to %s partial syntheses", len(groups), len(findings))
+                if not findings:
+                    raise RuntimeError("every partial synthesis failed")
             
-            # Extract bullet points
-            bullet_points = []
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                    bullet_points.append(line[1:].strip())
-                elif len(line) > 30 and not any(line.startswith(prefix) for prefix in ['Here', 'Based', 'The following']):
-                    bullet_points.append(line)
+            bullet_points = await self._synthesize_partial(findings, subject, purpose)
             
             # Ensure we have 5-7 points
             if len(bullet_points) < 5:
                 # Add fallback points
-                bullet_points.extend([
+                bullet_points = bullet_points + [
                     f"Research indicates {subject} is a significant policy area requiring attention.",
                     f"Multiple government sources provide relevant context for {purpose}."
-                ][:5 - len(bullet_points)])
+                ][:5 - len(bullet_points)]
             elif len(bullet_points) > 7:
                 bullet_points = bullet_points[:7]
             
             return bullet_points
             
         except Exception as e:
-            logger.error(f"Synthesis generation error: {e}")
+            logger.error("Synthesis generation error: %s", e)
             # Fallback synthesis
             fallback_summary = [
                 f"Research compiled from {len(source_summaries)} government and policy sources.",
@@ -328,5 +880,42 @@ Return only the bullet points, starting each with "•":
                 "Further analysis recommended based on collected research."
             ]
             
-            logger.info(f"SYNTHESIS FALLBACK OUTPUT - {len(fallback_summary)} fallback points")
-            return fallback_summary
\ No newline at end of file
+            logger.info("SYNTHESIS FALLBACK OUTPUT - %s fallback points", len(fallback_summary))
+            return fallback_summary
+    
+    async def _synthesize_partial(self, source_summaries: List[SourceSummary], subject: str, purpose: str) -> List[str]:
+        """
+        Synthesize a set of source summaries into up to 7 bullet points in one request
+        """
+        # Combine all source summaries, leaving out points another source already made
+        all_points = list(_distinct_points(source_summaries))
+        
+        combined_summaries = "\n".join(all_points)
+        
+        logger.debug("SYNTHESIS COMBINED INPUT: %s total points from %s sources", len(all_points), len(source_summaries))
+        
+        cache_key = SummaryCache.make_key("gpt-4o-mini", PROMPT_VERSION, "synthesis", subject, purpose, *sorted(all_points))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = _SYNTHESIS_PROMPT.substitute(subject=subject, purpose=purpose, combined_summaries=combined_summaries)
+        
+        bullet_points = await self._stream_bullets(
+            7,
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _SYNTHESIS_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.4,
+            max_tokens=7 * _TOKENS_PER_SYNTHESIS_BULLET + _JSON_OVERHEAD_TOKENS
+        )
+        
+        # ADD: Raw LLM output logging
+        logger.info("SYNTHESIS LLM_OUTPUT: %s", bullet_points)
+        
+        # Only a complete answer is cached; a reply cut off at max_tokens is not
+        if len(bullet_points) >= 5:
+            self.cache.set(cache_key, bullet_points[:7])
+        return bullet_points[:7]
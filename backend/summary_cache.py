@@ -0,0 +1,57 @@
+import hashlib
+import os
+from typing import List, Optional, Dict, Any
+import logging
+
+import diskcache
+
+logger = logging.getLogger(__name__)
+
+class SummaryCache:
+    """
+    Persistent store of LLM bullet-point summaries keyed by a hash of the
+    model and prompt inputs, so repeated documents skip the API call
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.getenv(
+            "SUMMARY_CACHE_DIR",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".summary_cache")
+        )
+        self.expire = 30 * 86400  # Seconds
+        self._cache = diskcache.Cache(self.directory)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        SHA-256 hex digest of the parts, separated so field boundaries can't collide
+        """
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        points = self._cache.get(key)
+        if points is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return points
+
+    def set(self, key: str, points: List[str]):
+        self._cache.set(key, points, expire=self.expire)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counts since startup plus the on-disk entry count
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._cache)
+        }
+
+    def close(self):
+        self._cache.close()